@@ -0,0 +1,13 @@
+# conftest.py
+# Shared pytest fixtures for the API tests (run against a live server)
+
+import httpx
+import pytest_asyncio
+
+from test_api import BASE_URL
+
+@pytest_asyncio.fixture
+async def client():
+    """One AsyncClient (and keep-alive connection pool) per test."""
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        yield client
@@ -2,20 +2,34 @@
 # FastAPI backend integration for the spaced repetition model
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import List, Dict, Iterator, Optional, Tuple
 import numpy as np
-import pandas as pd
+import orjson
 import tensorflow as tf
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-import joblib
-from datetime import datetime, timedelta
-import json
+from numba import njit
+from datetime import date, timedelta
+from contextlib import asynccontextmanager
+import functools
+import threading
 import os
 from tensorflow.keras.losses import MeanSquaredError # type: ignore
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
-import os
+
+# Optional: ONNX Runtime serves large schedule batches on GPU nodes
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Each request runs a tiny model, so keep TensorFlow single-threaded and scale out
+# with uvicorn worker processes (--workers) instead of intra-op thread pools.
+# This has to run before TensorFlow initializes its runtime.
+tf.config.threading.set_intra_op_parallelism_threads(1)
+tf.config.threading.set_inter_op_parallelism_threads(1)
+tf.config.set_soft_device_placement(True)
 
 # Load environment variables from .env
 load_dotenv()
@@ -29,6 +43,8 @@ subject_encoder_path = os.getenv("SUBJECT_ENCODER_PATH")
 
 # Pydantic models for API requests
 class StudyItem(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+    
     item_id: str
     difficulty: str  # 'easy', 'medium', 'hard'
     subject: str     # 'math', 'science', 'language', 'history', 'art'
@@ -41,6 +57,8 @@ class StudyItem(BaseModel):
     ease_factor: Optional[float] = None
 
 class PredictionRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+    
     difficulty: str
     subject: str
     response_time: float
@@ -52,15 +70,124 @@ class PredictionRequest(BaseModel):
     ease_factor: Optional[float] = None
 
 class ScheduleRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+    
     items: List[StudyItem]
     days_ahead: int = 30
 
+class UpdateEaseRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+    
+    current_ease: float
+    performance: float
+
+# Per-difficulty interval multipliers and priority weights; unknown difficulties use 1.0
+_DIFFICULTY_MULTIPLIERS = {'easy': 1.2, 'medium': 1.0, 'hard': 0.7}
+_DIFFICULTY_WEIGHTS = {'easy': 1.0, 'medium': 0.8, 'hard': 0.6}
+
+# Success-rate bands: < 0.3, < 0.6, <= 0.9 and > 0.9 (searched with side='right', so the
+# last threshold is nudged above 0.9 to keep exactly 0.9 in the neutral band)
+_SUCCESS_THRESHOLDS = np.array([0.3, 0.6, np.nextafter(0.9, np.inf)])
+_SUCCESS_MULTIPLIERS = np.array([0.3, 0.6, 1.0, 1.3])
+
+# Smallest batch worth a GPU round trip; smaller batches stay on the CPU paths
+_ONNX_MIN_BATCH = 64
+
+# Schedule entries serialized per chunk when streaming a /schedule response
+_STREAM_CHUNK_SIZE = 256
+
+@njit(cache=True)
+def _adjust(prediction, success_rate, difficulty_multiplier):
+    """Turn a raw sigmoid output into a review interval in [1, 90] days."""
+    # Scale from [0,1] back to [1,90] days (matching training data)
+    prediction = 1.0 + prediction * 89.0
+    
+    # Apply business logic adjustments; clamping to [1, 90] covers every band
+    band = np.searchsorted(_SUCCESS_THRESHOLDS, success_rate, side='right')
+    prediction = max(1.0, min(prediction * _SUCCESS_MULTIPLIERS[band], 90.0))
+    
+    # Difficulty adjustments
+    prediction *= difficulty_multiplier
+    
+    # Ensure bounds
+    return max(1.0, min(prediction, 90.0))
+
+@njit(cache=True)
+def _priority(interval, difficulty_weight, success_rate):
+    """Calculate priority score for scheduling (lower = more urgent)."""
+    priority = interval * difficulty_weight
+    
+    # Success rate adjustment
+    if success_rate < 0.6:
+        priority *= 0.7
+    
+    return priority
+
+@njit(cache=True)
+def _adjust_batch(predictions, success_rates, difficulty_multipliers, difficulty_weights):
+    """Apply _adjust and _priority across a batch of raw predictions."""
+    n = predictions.shape[0]
+    intervals = np.empty(n)
+    priorities = np.empty(n)
+    for i in range(n):
+        intervals[i] = _adjust(predictions[i], success_rates[i], difficulty_multipliers[i])
+        priorities[i] = _priority(intervals[i], difficulty_weights[i], success_rates[i])
+    return intervals, priorities
+
+@njit(cache=True)
+def _update_ease(current_ease, performance, ease_min, ease_max):
+    """Scale the ease factor by performance and clamp it to [ease_min, ease_max]."""
+    multiplier = 1.1 if performance >= 0.8 else (1.0 if performance >= 0.6 else 0.8)
+    new_ease = current_ease * multiplier
+    return ease_min if new_ease < ease_min else (ease_max if new_ease > ease_max else new_ease)
+
+# Compile up front (or load from the on-disk cache) instead of on the first request
+_adjust(0.5, 0.5, 1.0)
+_priority(1.0, 1.0, 0.5)
+_adjust_batch(np.zeros(1), np.zeros(1), np.ones(1), np.ones(1))
+_update_ease(2.5, 0.5, 1.3, 2.5)
+
+def _difficulty_tables(classes) -> Tuple[Dict[str, int], np.ndarray, np.ndarray, np.ndarray]:
+    """Build the id lookup and per-id parameter arrays for the encoder's difficulty classes.
+    
+    Ids are the encoded classes plus one trailing slot for unknown labels, which
+    encode as the first category and use neutral 1.0 factors.
+    """
+    difficulties = list(classes)
+    diff_id = {c: i for i, c in enumerate(difficulties)}
+    diff_code = np.array(list(range(len(difficulties))) + [0])
+    pred_mult = np.array([_DIFFICULTY_MULTIPLIERS.get(c, 1.0) for c in difficulties] + [1.0])
+    prio_w = np.array([_DIFFICULTY_WEIGHTS.get(c, 1.0) for c in difficulties] + [1.0])
+    return diff_id, diff_code, pred_mult, prio_w
+
+@functools.lru_cache(maxsize=1)
+def _review_dates(today: date) -> Tuple[str, ...]:
+    """ISO date strings for today + 0..90 days, built once per calendar day."""
+    return tuple((today + timedelta(days=i)).isoformat() for i in range(91))
+
 class SpacedRepetitionAPI:
     def __init__(self, model_path: str = "spaced_repetition_model"):
         self.model = None
+        self._infer = None
+        self._layers = None
+        self._interpreter = None
+        self._in_idx = None
+        self._out_idx = None
+        self._onnx_session = None
+        self._onnx_input = None
         self.scaler = None
+        self._mean = None
+        self._inv_scale = None
         self.difficulty_encoder = None
         self.subject_encoder = None
+        self._diff_id = {}
+        self._unknown_diff = 0
+        self._diff_code = None
+        self._diff_pred_mult = None
+        self._diff_prio_w = None
+        self._subj_map = {}
+        self._predict_cached = None
+        self._buffers = None
         self.is_loaded = False
         self.ease_factor_default = 2.5
         self.ease_factor_min = 1.3
@@ -71,6 +198,10 @@ class SpacedRepetitionAPI:
     
     def load_model(self, filepath: str):
         """Load the trained model and preprocessors."""
+        # Imported lazily so processes that never load a model skip joblib (and
+        # the scikit-learn classes the pickles pull in) entirely
+        import joblib
+        
         try:
             model_files = {
                 'model': f"{filepath}_model.h5",
@@ -93,11 +224,66 @@ class SpacedRepetitionAPI:
             # Load the Keras model
             self.model = tf.keras.models.load_model(model_files['model'], custom_objects={"mse": MeanSquaredError()})
             
+            self._infer = None  # Traced lazily, only if _forward ever needs it
+            
+            # The network is a small dense MLP, so run it as plain NumPy matmuls
+            # and skip framework dispatch entirely when every layer is supported
+            self._layers = self._extract_dense_layers(self.model)
+            
+            # Otherwise prefer the TFLite FlatBuffer for single rows when it has been
+            # exported, taking the float16-quantized variant over the plain float32 one
+            tflite_path = None
+            if self._layers is not None:
+                print("Serving predictions with the NumPy forward pass")
+            else:
+                tflite_path = next(
+                    (path for path in (f"{filepath}_model_fp16.tflite", f"{filepath}_model.tflite")
+                     if os.path.exists(path)),
+                    None
+                )
+            if tflite_path is not None:
+                self._interpreter = tf.lite.Interpreter(model_path=tflite_path)
+                self._interpreter.allocate_tensors()
+                self._in_idx = self._interpreter.get_input_details()[0]['index']
+                self._out_idx = self._interpreter.get_output_details()[0]['index']
+                print(f"Using TFLite model from {os.path.abspath(tflite_path)}")
+            
+            # Use an exported ONNX model for large batches, but only when a GPU is available
+            onnx_path = f"{filepath}_model.onnx"
+            if (ort is not None and os.path.exists(onnx_path)
+                    and 'CUDAExecutionProvider' in ort.get_available_providers()):
+                session = ort.InferenceSession(
+                    onnx_path, providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
+                )
+                # The provider list only reflects how onnxruntime was built; without a
+                # usable GPU the session silently falls back to CPU, where NumPy is faster
+                if session.get_providers()[0] == 'CUDAExecutionProvider':
+                    self._onnx_session = session
+                    self._onnx_input = session.get_inputs()[0].name
+                    print(f"Using ONNX Runtime (GPU) model from {os.path.abspath(onnx_path)}")
+            
             # Load preprocessors
             self.scaler = joblib.load(model_files['scaler'])
+            # Apply the scaler as a plain affine transform, skipping sklearn's input validation
+            self._mean = self.scaler.mean_.astype(np.float32)
+            self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
             self.difficulty_encoder = joblib.load(model_files['difficulty_encoder'])
             self.subject_encoder = joblib.load(model_files['subject_encoder'])
             
+            # O(1) category lookups instead of a LabelEncoder.transform per request
+            self._subj_map = {c: i for i, c in enumerate(self.subject_encoder.classes_)}
+            
+            # Every per-difficulty parameter is an array indexed by one integer id
+            (self._diff_id, self._diff_code,
+             self._diff_pred_mult, self._diff_prio_w) = _difficulty_tables(self.difficulty_encoder.classes_)
+            self._unknown_diff = len(self._diff_id)
+            
+            # Per-thread (1, 9) float32 buffers reused by every single-item prediction
+            self._buffers = threading.local()
+            
+            # Memoize predictions per model; request features are quantized into the key
+            self._predict_cached = functools.lru_cache(maxsize=4096)(self._predict_quantized)
+            
             self.is_loaded = True
             print(f"Model loaded successfully from {filepath}")
             
@@ -105,127 +291,281 @@ class SpacedRepetitionAPI:
             print(f"Error loading model: {str(e)}")
             raise e
     
-    def predict_optimal_interval(self, request: PredictionRequest) -> float:
-        """Predict optimal review interval."""
-        if not self.is_loaded:
-            raise HTTPException(status_code=500, detail="Model not loaded")
-        
-        ease_factor = request.ease_factor or self.ease_factor_default
+    @staticmethod
+    def _extract_dense_layers(model) -> Optional[List[Tuple[np.ndarray, np.ndarray, str]]]:
+        """Collect (kernel, bias, activation) for each Dense layer of the model.
         
-        # Handle unknown categories
-        try:
-            difficulty_encoded = self.difficulty_encoder.transform([request.difficulty])[0]
-        except ValueError:
-            difficulty_encoded = 0  # Default to first category
+        Returns None if the model contains layers the NumPy forward pass cannot run.
+        """
+        layers = []
+        for layer in model.layers:
+            if isinstance(layer, (tf.keras.layers.InputLayer, tf.keras.layers.Dropout)):
+                continue  # No-ops at inference time
+            if not isinstance(layer, tf.keras.layers.Dense):
+                return None
             
-        try:
-            subject_encoded = self.subject_encoder.transform([request.subject])[0]
-        except ValueError:
-            subject_encoded = 0  # Default to first category
+            activation = layer.activation.__name__
+            if activation not in ('linear', 'relu', 'sigmoid'):
+                return None
+            
+            weights = layer.get_weights()
+            kernel = np.asarray(weights[0], dtype=np.float32)
+            bias = (np.asarray(weights[1], dtype=np.float32) if layer.use_bias
+                    else np.zeros(kernel.shape[1], dtype=np.float32))
+            layers.append((kernel, bias, activation))
         
-        # Prepare features
-        features = np.array([[
-            difficulty_encoded, subject_encoded, request.response_time,
-            request.previous_attempts, request.success_rate, request.days_since_last_review,
-            request.study_streak, request.current_accuracy, ease_factor
-        ]])
+        return layers
+    
+    def _forward(self, features_scaled: np.ndarray) -> np.ndarray:
+        """Run the model on scaled features and return its raw (n, 1) outputs."""
+        if self._onnx_session is not None and len(features_scaled) >= _ONNX_MIN_BATCH:
+            return self._onnx_session.run(
+                None, {self._onnx_input: features_scaled.astype(np.float32, copy=False)}
+            )[0]
         
-        # Scale features
-        features_scaled = self.scaler.transform(features)
+        if self._layers is not None:
+            x = features_scaled.astype(np.float32, copy=False)
+            for kernel, bias, activation in self._layers:
+                x = x @ kernel + bias
+                if activation == 'relu':
+                    np.maximum(x, 0, out=x)
+                elif activation == 'sigmoid':
+                    x = 1 / (1 + np.exp(-x))
+            return x
         
-        # Make prediction (model outputs sigmoid, need to scale back)
-        prediction = self.model.predict(features_scaled, verbose=0)[0][0]
+        if len(features_scaled) != 1:
+            # The interpreter and traced function are pinned to a single row
+            return self.model(features_scaled.astype(np.float32), training=False).numpy()
         
-        # Scale from [0,1] back to [1,90] days (matching training data)
-        prediction = 1 + (prediction * 89)
+        if self._interpreter is not None:
+            self._interpreter.set_tensor(self._in_idx, features_scaled.astype(np.float32, copy=False))
+            self._interpreter.invoke()
+            return self._interpreter.get_tensor(self._out_idx)
         
-        # Apply business logic adjustments
-        if request.success_rate < 0.3:
-            prediction = max(1, prediction * 0.3)
-        elif request.success_rate < 0.6:
-            prediction = max(1, prediction * 0.6)
-        elif request.success_rate > 0.9:
-            prediction = min(90, prediction * 1.3)
+        if self._infer is None:
+            # Trace a fixed-shape, XLA-compiled inference function once so that
+            # single-row requests skip model.predict's per-call adapter overhead
+            self._infer = tf.function(
+                lambda x: self.model(x, training=False),
+                jit_compile=True,
+                input_signature=[tf.TensorSpec(shape=(1, 9), dtype=tf.float32)]
+            )
+        return self._infer(tf.convert_to_tensor(features_scaled, dtype=tf.float32)).numpy()
+    
+    def export_tflite(self, filepath: str = "spaced_repetition_model", float16: bool = True) -> str:
+        """Convert the loaded Keras model to a TFLite FlatBuffer for serving.
         
-        # Difficulty adjustments
-        difficulty_multipliers = {'easy': 1.2, 'medium': 1.0, 'hard': 0.7}
-        prediction *= difficulty_multipliers.get(request.difficulty, 1.0)
+        By default the weights are quantized to float16, which halves their size
+        while inputs and outputs stay float32. Full-integer (int8) quantization is
+        deliberately not offered: its kernels are slower than float on x86 for a
+        model this small.
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded")
         
-        # Ensure bounds
-        prediction = max(1, min(prediction, 90))
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        if float16:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        tflite_model = converter.convert()
+        tflite_path = f"{filepath}_model_fp16.tflite" if float16 else f"{filepath}_model.tflite"
+        with open(tflite_path, "wb") as f:
+            f.write(tflite_model)
         
-        return float(prediction)
+        print(f"TFLite model written to {os.path.abspath(tflite_path)}")
+        return tflite_path
+    
+    def export_onnx(self, filepath: str = "spaced_repetition_model") -> str:
+        """Convert the loaded Keras model to ONNX for GPU batch inference.
+        
+        tf2onnx.convert.from_keras does not support the Keras 3 models that
+        TensorFlow 2.18 loads (they no longer expose output_names), so the model
+        call is traced as a tf.function and converted with from_function instead.
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded")
+        
+        import tf2onnx  # Only needed for this offline conversion
+        
+        input_signature = [tf.TensorSpec(shape=(None, 9), dtype=tf.float32, name='input')]
+        model_fn = tf.function(lambda x: self.model(x, training=False), input_signature=input_signature)
+        
+        onnx_path = f"{filepath}_model.onnx"
+        tf2onnx.convert.from_function(
+            model_fn,
+            input_signature=input_signature,
+            opset=17,
+            output_path=onnx_path
+        )
+        
+        print(f"ONNX model written to {os.path.abspath(onnx_path)}")
+        return onnx_path
+    
+    def predict_optimal_interval(self, request: PredictionRequest) -> float:
+        """Predict optimal review interval."""
+        if not self.is_loaded:
+            raise HTTPException(status_code=500, detail="Model not loaded")
+        
+        ease_factor = self.ease_factor_default if request.ease_factor is None else request.ease_factor
+        
+        # Round continuous features to coarse steps so repeat requests hit the cache
+        prediction = self._predict_cached(
+            request.difficulty, request.subject, round(request.response_time, 1),
+            request.previous_attempts, round(request.success_rate, 2),
+            round(request.days_since_last_review, 1), request.study_streak,
+            round(request.current_accuracy, 2), round(ease_factor, 2)
+        )
+        
+        # Business rules use the exact success rate, matching the schedule path
+        did = self._diff_id.get(request.difficulty, self._unknown_diff)
+        return _adjust(prediction, float(request.success_rate), float(self._diff_pred_mult[did]))
+    
+    def _predict_quantized(self, difficulty: str, subject: str, response_time: float,
+                           previous_attempts: int, success_rate: float,
+                           days_since_last_review: float, study_streak: int,
+                           current_accuracy: float, ease_factor: float) -> float:
+        """Return the raw model output for already-quantized features (cached per model)."""
+        # Handle unknown categories (default to first category)
+        did = self._diff_id.get(difficulty, self._unknown_diff)
+        subject_encoded = self._subj_map.get(subject, 0)
+        
+        # Prepare features in place
+        features, features_scaled = self._row_buffers()
+        features[0] = (
+            self._diff_code[did], subject_encoded, response_time,
+            previous_attempts, success_rate, days_since_last_review,
+            study_streak, current_accuracy, ease_factor
+        )
+        
+        # Scale features
+        np.subtract(features, self._mean, out=features_scaled)
+        np.multiply(features_scaled, self._inv_scale, out=features_scaled)
+        
+        # Model outputs sigmoid; _adjust scales it back to days
+        return float(self._forward(features_scaled)[0, 0])
+    
+    def _row_buffers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return this thread's preallocated raw and scaled feature rows."""
+        buffers = self._buffers
+        if not hasattr(buffers, 'features'):
+            buffers.features = np.empty((1, 9), dtype=np.float32)
+            buffers.features_scaled = np.empty((1, 9), dtype=np.float32)
+        return buffers.features, buffers.features_scaled
     
     def generate_study_schedule(self, request: ScheduleRequest) -> List[Dict]:
         """Generate study schedule for multiple items."""
+        return list(self.iter_study_schedule(request))
+    
+    def iter_study_schedule(self, request: ScheduleRequest) -> Iterator[Dict]:
+        """Compute the schedule eagerly and return its entries lazily, in priority order."""
         if not self.is_loaded:
             raise HTTPException(status_code=500, detail="Model not loaded")
         
-        schedule = []
-        current_date = datetime.now()
+        items = request.items
+        if not items:
+            return iter(())
         
-        for item in request.items:
-            # Create prediction request from study item
-            pred_request = PredictionRequest(
-                difficulty=item.difficulty,
-                subject=item.subject,
-                response_time=item.response_time,
-                previous_attempts=item.previous_attempts,
-                success_rate=item.success_rate,
-                days_since_last_review=item.days_since_last_review,
-                study_streak=item.study_streak,
-                current_accuracy=item.current_accuracy,
-                ease_factor=item.ease_factor
-            )
-            
-            interval = self.predict_optimal_interval(pred_request)
-            next_review_date = current_date + timedelta(days=float(interval))
-            
-            if next_review_date <= current_date + timedelta(days=request.days_ahead):
-                priority = self._calculate_priority(item, interval)
-                
-                schedule.append({
-                    'item_id': item.item_id,
-                    'subject': item.subject,
-                    'difficulty': item.difficulty,
-                    'next_review_date': next_review_date.strftime('%Y-%m-%d'),
-                    'days_until_review': int(interval),
-                    'priority': priority,
-                    'success_rate': item.success_rate
-                })
+        review_dates = _review_dates(date.today())
         
-        # Sort by priority (lower = more urgent)
-        schedule.sort(key=lambda x: x['priority'])
+        # Build one feature matrix so the whole batch goes through the model at once
+        difficulties = [item.difficulty for item in items]
+        diff_ids = np.array([self._diff_id.get(d, self._unknown_diff) for d in difficulties], dtype=np.int64)
+        success_rates = np.array([item.success_rate for item in items], dtype=np.float64)
+        features = np.column_stack([
+            self._diff_code[diff_ids],
+            [self._subj_map.get(item.subject, 0) for item in items],
+            [item.response_time for item in items],
+            [item.previous_attempts for item in items],
+            success_rates,
+            [item.days_since_last_review for item in items],
+            [item.study_streak for item in items],
+            [item.current_accuracy for item in items],
+            [self.ease_factor_default if item.ease_factor is None else item.ease_factor
+             for item in items]
+        ]).astype(np.float32)
         
-        return schedule
-    
-    def _calculate_priority(self, item: StudyItem, interval: float) -> float:
-        """Calculate priority score for scheduling."""
-        priority = interval
+        features_scaled = (features - self._mean) * self._inv_scale
+        predictions = self._forward(features_scaled).ravel().astype(np.float64)
+        intervals, priorities = _adjust_batch(
+            predictions, success_rates, self._diff_pred_mult[diff_ids], self._diff_prio_w[diff_ids]
+        )
+        
+        # Sort due items by priority (lower = more urgent); stable, like list.sort, for ties
+        due = np.flatnonzero(intervals <= request.days_ahead)
+        order = due[np.argsort(priorities[due], kind='stable')]
         
-        # Difficulty adjustment
-        difficulty_weights = {'easy': 1.0, 'medium': 0.8, 'hard': 0.6}
-        priority *= difficulty_weights.get(item.difficulty, 1.0)
+        return (
+            self._schedule_record(items[i], int(intervals[i]), float(priorities[i]), review_dates)
+            for i in order
+        )
+    
+    @staticmethod
+    def _schedule_record(item: StudyItem, days_until_review: int, priority: float,
+                         review_dates: Tuple[str, ...]) -> Dict:
+        """Build the response entry for one scheduled item."""
+        return {
+            'item_id': item.item_id,
+            'subject': item.subject,
+            'difficulty': item.difficulty,
+            'next_review_date': review_dates[days_until_review],
+            'days_until_review': days_until_review,
+            'priority': priority,
+            'success_rate': item.success_rate
+        }
+    
+    def warm_up(self):
+        """Run every inference path once so tracing and compilation happen before traffic."""
+        items = [
+            StudyItem(
+                item_id=f"warmup_{difficulty}", difficulty=difficulty, subject='math',
+                response_time=0, previous_attempts=0, success_rate=0.5,
+                days_since_last_review=0, study_streak=0, current_accuracy=0.5
+            )
+            for difficulty in ('easy', 'medium', 'hard')
+        ]
         
-        # Success rate adjustment
-        if item.success_rate < 0.6:
-            priority *= 0.7
+        for item in items:
+            self.predict_optimal_interval(PredictionRequest(**item.model_dump(exclude={'item_id'})))
+        self.generate_study_schedule(ScheduleRequest(items=items))
         
-        return priority
+        # Batches this large are routed to ONNX Runtime when a GPU session is loaded
+        self._forward(np.zeros((_ONNX_MIN_BATCH, 9), dtype=np.float32))
     
     def update_ease_factor(self, current_ease: float, performance: float) -> float:
         """Update ease factor based on performance."""
-        if performance >= 0.8:
-            new_ease = current_ease * 1.1
-        elif performance >= 0.6:
-            new_ease = current_ease
-        else:
-            new_ease = current_ease * 0.8
-        
-        return max(self.ease_factor_min, min(new_ease, self.ease_factor_max))
+        return _update_ease(float(current_ease), float(performance),
+                            self.ease_factor_min, self.ease_factor_max)
+
+sr_api: Optional[SpacedRepetitionAPI] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm up the model before the server starts accepting requests."""
+    global sr_api
+    
+    # Initialize the model (make sure model files are in the same directory)
+    try:
+        sr_api = SpacedRepetitionAPI()
+    except Exception as e:
+        print(f"Warning: Could not load model on startup: {e}")
+        sr_api = None
+    
+    # A failed warm-up only costs first-request latency; keep serving the loaded model
+    if sr_api is not None:
+        try:
+            sr_api.warm_up()
+        except Exception as e:
+            print(f"Warning: Model warm-up failed: {e}")
+    
+    yield
 
 # Initialize the API
-app = FastAPI(title="Spaced Repetition API", version="1.0.0")
+app = FastAPI(
+    title="Spaced Repetition API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # C-backed JSON encoding for large schedules
+)
 
 # 👇 Allow frontend to access backend
 app.add_middleware(
@@ -236,13 +576,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the model (make sure model files are in the same directory)
-try:
-    sr_api = SpacedRepetitionAPI()
-except Exception as e:
-    print(f"Warning: Could not load model on startup: {e}")
-    sr_api = None
-
 @app.get("/")
 async def root():
     return {"message": "Spaced Repetition API is running"}
@@ -262,7 +595,8 @@ async def predict_interval(request: PredictionRequest):
     
     try:
         interval = sr_api.predict_optimal_interval(request)
-        next_review_date = (datetime.now() + timedelta(days=interval)).strftime('%Y-%m-%d')
+        # Whole-day offset from today, the same dates /schedule reports
+        next_review_date = _review_dates(date.today())[int(interval)]
         
         return {
             "optimal_interval_days": round(interval, 1),
@@ -279,26 +613,37 @@ async def generate_schedule(request: ScheduleRequest):
         raise HTTPException(status_code=500, detail="Model not loaded")
     
     try:
-        schedule = sr_api.generate_study_schedule(request)
-        
-        return {
-            "schedule": schedule,
-            "total_items": len(schedule),
-            "success": True
-        }
+        schedule = sr_api.iter_study_schedule(request)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Schedule generation failed: {str(e)}")
+    
+    async def stream():
+        # Same document as before, written out in chunks while entries are being built
+        yield b'{"schedule":['
+        total_items = 0
+        chunk = []
+        for entry in schedule:
+            chunk.append(orjson.dumps(entry))
+            total_items += 1
+            if len(chunk) == _STREAM_CHUNK_SIZE:
+                yield (b',' if total_items > len(chunk) else b'') + b','.join(chunk)
+                chunk = []
+        if chunk:
+            yield (b',' if total_items > len(chunk) else b'') + b','.join(chunk)
+        yield b'],"total_items":' + str(total_items).encode() + b',"success":true}'
+    
+    return StreamingResponse(stream(), media_type="application/json")
 
 @app.post("/update_ease_factor")
-async def update_ease_factor(current_ease: float, performance: float):
+async def update_ease_factor(request: UpdateEaseRequest):
     """Update ease factor based on performance."""
     if sr_api is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
     
     try:
-        new_ease = sr_api.update_ease_factor(current_ease, performance)
+        new_ease = sr_api.update_ease_factor(request.current_ease, request.performance)
         return {
-            "old_ease_factor": current_ease,
+            "old_ease_factor": request.current_ease,
             "new_ease_factor": round(new_ease, 2),
             "success": True
         }
@@ -1,37 +1,49 @@
 # test_api.py
 # Test script for the Spaced Repetition API
 
-import requests
+import asyncio
+import time
+import httpx
+import pytest
 import json
 from datetime import datetime
 
 # API base URL (adjust if running on different host/port)
 BASE_URL = "http://localhost:8000"
 
-def test_health_check():
+# Every test is a coroutine; the `client` fixture lives in conftest.py
+pytestmark = pytest.mark.asyncio
+
+# Number of simultaneous /predict calls fired by the load test
+CONCURRENT_REQUESTS = 100
+
+PREDICTION_DATA = {
+    "difficulty": "medium",
+    "subject": "math",
+    "response_time": 20.0,
+    "previous_attempts": 3,
+    "success_rate": 0.7,
+    "days_since_last_review": 5.0,
+    "study_streak": 10,
+    "current_accuracy": 0.8
+}
+
+async def test_health_check(client: httpx.AsyncClient):
     """Test the health check endpoint."""
     print("Testing health check...")
-    response = requests.get(f"{BASE_URL}/health")
+    response = await client.get("/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     print("-" * 50)
+    
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "model_loaded": True}
 
-def test_single_prediction():
+async def test_single_prediction(client: httpx.AsyncClient):
     """Test single prediction endpoint."""
     print("Testing single prediction...")
     
-    data = {
-        "difficulty": "medium",
-        "subject": "math",
-        "response_time": 20.0,
-        "previous_attempts": 3,
-        "success_rate": 0.7,
-        "days_since_last_review": 5.0,
-        "study_streak": 10,
-        "current_accuracy": 0.8
-    }
-    
-    response = requests.post(f"{BASE_URL}/predict", json=data)
+    response = await client.post("/predict", json=PREDICTION_DATA)
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         result = response.json()
@@ -40,8 +52,33 @@ def test_single_prediction():
     else:
         print(f"Error: {response.json()}")
     print("-" * 50)
+    
+    assert response.status_code == 200
+    result = response.json()
+    assert result["success"] is True
+    assert 1 <= result["optimal_interval_days"] <= 90
+    datetime.strptime(result["next_review_date"], "%Y-%m-%d")
 
-def test_schedule_generation():
+async def test_concurrent_predictions(client: httpx.AsyncClient):
+    """Fire many /predict calls at once over a shared connection pool."""
+    print(f"Testing {CONCURRENT_REQUESTS} concurrent predictions...")
+    
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[
+        client.post("/predict", json=PREDICTION_DATA) for _ in range(CONCURRENT_REQUESTS)
+    ])
+    elapsed = time.perf_counter() - start
+    
+    succeeded = sum(response.status_code == 200 for response in responses)
+    print(f"Succeeded: {succeeded}/{CONCURRENT_REQUESTS}")
+    print(f"Total time: {elapsed:.3f}s ({CONCURRENT_REQUESTS / elapsed:.1f} requests/s)")
+    print("-" * 50)
+    
+    assert succeeded == CONCURRENT_REQUESTS
+    # Identical requests must get identical answers, however they interleave
+    assert len({json.dumps(response.json(), sort_keys=True) for response in responses}) == 1
+
+async def test_schedule_generation(client: httpx.AsyncClient):
     """Test study schedule generation."""
     print("Testing schedule generation...")
     
@@ -84,7 +121,7 @@ def test_schedule_generation():
         "days_ahead": 14
     }
     
-    response = requests.post(f"{BASE_URL}/schedule", json=data)
+    response = await client.post("/schedule", json=data)
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         result = response.json()
@@ -98,12 +135,30 @@ def test_schedule_generation():
     else:
         print(f"Error: {response.json()}")
     print("-" * 50)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    result = response.json()
+    assert list(result) == ["schedule", "total_items", "success"]
+    assert result["success"] is True
+    assert result["total_items"] == len(result["schedule"])
+    assert result["total_items"] <= len(data["items"])
+    
+    item_ids = {item["item_id"] for item in data["items"]}
+    priorities = [item["priority"] for item in result["schedule"]]
+    assert priorities == sorted(priorities)  # Lower = more urgent, listed first
+    for item in result["schedule"]:
+        assert set(item) == {"item_id", "subject", "difficulty", "next_review_date",
+                             "days_until_review", "priority", "success_rate"}
+        assert item["item_id"] in item_ids
+        assert 1 <= item["days_until_review"] <= data["days_ahead"]
+        datetime.strptime(item["next_review_date"], "%Y-%m-%d")
 
-def test_ease_factor_update():
+async def test_ease_factor_update(client: httpx.AsyncClient):
     """Test ease factor update."""
     print("Testing ease factor update...")
     
-    response = requests.post(f"{BASE_URL}/update_ease_factor?current_ease=2.5&performance=0.8")
+    response = await client.post("/update_ease_factor", json={"current_ease": 2.5, "performance": 0.8})
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         result = response.json()
@@ -112,24 +167,34 @@ def test_ease_factor_update():
     else:
         print(f"Error: {response.json()}")
     print("-" * 50)
+    
+    assert response.status_code == 200
+    # 2.5 * 1.1 is clamped back to the 2.5 maximum
+    assert response.json() == {"old_ease_factor": 2.5, "new_ease_factor": 2.5, "success": True}
+
+async def main():
+    # One client keeps a pool of keep-alive connections for every test
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        await test_health_check(client)
+        await test_single_prediction(client)
+        await test_concurrent_predictions(client)
+        await test_schedule_generation(client)
+        await test_ease_factor_update(client)
 
 if __name__ == "__main__":
     print("Testing Spaced Repetition API")
     print("=" * 50)
     
     try:
-        test_health_check()
-        test_single_prediction()
-        test_schedule_generation()
-        test_ease_factor_update()
+        asyncio.run(main())
         
         print("All tests completed!")
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("Error: Could not connect to API. Make sure the FastAPI server is running.")
         print("Run: python fastapi_spaced_repetition.py")
     except Exception as e:
-        print(f"Test failed with error: {e}")
+        print(f"Test failed with error: {e!r}")
 
 # Example curl commands for testing:
 print("\nExample curl commands:")
@@ -0,0 +1,106 @@
+# test_business_rules.py
+# Unit tests for the compiled business-rule kernels (no running server needed)
+
+import numpy as np
+import pytest
+
+from fastapi_spaced_repetition import (
+    _adjust, _adjust_batch, _difficulty_tables, _priority, _update_ease
+)
+
+# Encoder classes as LabelEncoder stores them (sorted)
+CLASSES = ['easy', 'hard', 'medium']
+DIFFICULTIES = ['easy', 'medium', 'hard', 'expert']  # 'expert' is unknown to the encoder
+SUCCESS_RATES = [0.0, 0.1, 0.29, 0.2999, 0.3, 0.3001, 0.45, 0.5999, 0.6, 0.6001,
+                 0.75, 0.8999, 0.9, 0.9001, 0.95, 1.0]
+RAW_OUTPUTS = [0.0, 0.01, 0.25, 0.5, 0.75, 0.99, 1.0]
+
+# Reference copies of the original scalar rules
+def reference_interval(raw, success_rate, difficulty):
+    prediction = 1 + (raw * 89)
+    if success_rate < 0.3:
+        prediction = max(1, prediction * 0.3)
+    elif success_rate < 0.6:
+        prediction = max(1, prediction * 0.6)
+    elif success_rate > 0.9:
+        prediction = min(90, prediction * 1.3)
+    difficulty_multipliers = {'easy': 1.2, 'medium': 1.0, 'hard': 0.7}
+    prediction *= difficulty_multipliers.get(difficulty, 1.0)
+    return max(1, min(prediction, 90))
+
+def reference_priority(interval, success_rate, difficulty):
+    difficulty_weights = {'easy': 1.0, 'medium': 0.8, 'hard': 0.6}
+    priority = interval * difficulty_weights.get(difficulty, 1.0)
+    if success_rate < 0.6:
+        priority *= 0.7
+    return priority
+
+def reference_ease(current_ease, performance, ease_min=1.3, ease_max=2.5):
+    if performance >= 0.8:
+        new_ease = current_ease * 1.1
+    elif performance >= 0.6:
+        new_ease = current_ease
+    else:
+        new_ease = current_ease * 0.8
+    return max(ease_min, min(new_ease, ease_max))
+
+def difficulty_params(difficulty):
+    """Gather (encoded class, multiplier, weight) the way SpacedRepetitionAPI does."""
+    diff_id, diff_code, pred_mult, prio_w = _difficulty_tables(CLASSES)
+    did = diff_id.get(difficulty, len(diff_id))
+    return diff_code[did], float(pred_mult[did]), float(prio_w[did])
+
+def test_unknown_difficulty_uses_first_category_and_neutral_factors():
+    assert difficulty_params('expert') == (0, 1.0, 1.0)
+    assert difficulty_params('hard') == (1, 0.7, 0.6)
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+@pytest.mark.parametrize("success_rate", SUCCESS_RATES)
+@pytest.mark.parametrize("raw", RAW_OUTPUTS)
+def test_adjust_and_priority_match_reference(raw, success_rate, difficulty):
+    _, multiplier, weight = difficulty_params(difficulty)
+
+    interval = _adjust(raw, success_rate, multiplier)
+    assert interval == pytest.approx(reference_interval(raw, success_rate, difficulty))
+    assert _priority(interval, weight, success_rate) == pytest.approx(
+        reference_priority(interval, success_rate, difficulty)
+    )
+
+@pytest.mark.parametrize("success_rate, expected", [
+    (0.2999, 45.5 * 0.3),
+    (0.3, 45.5 * 0.6),   # 0.3 itself is in the < 0.6 band
+    (0.5999, 45.5 * 0.6),
+    (0.6, 45.5),         # 0.6 itself is neutral
+    (0.9, 45.5),         # 0.9 itself is neutral; only > 0.9 is boosted
+    (0.9001, 45.5 * 1.3),
+])
+def test_success_rate_band_edges(success_rate, expected):
+    # raw 0.5 -> 45.5 days before adjustments; 'medium' multiplier is 1.0
+    assert _adjust(0.5, success_rate, 1.0) == pytest.approx(expected)
+
+def test_band_clamp_applies_before_difficulty_multiplier():
+    # 90 * 1.3 is capped at 90 before the 'hard' 0.7 multiplier, not after
+    assert _adjust(1.0, 0.95, 0.7) == pytest.approx(63.0)
+    # 1 * 0.3 is raised to 1 before the 'easy' 1.2 multiplier
+    assert _adjust(0.0, 0.1, 1.2) == pytest.approx(1.2)
+
+def test_adjust_batch_matches_scalar_kernels():
+    raws, rates, difficulties = zip(*[
+        (raw, rate, difficulty)
+        for raw in RAW_OUTPUTS for rate in SUCCESS_RATES for difficulty in DIFFICULTIES
+    ])
+    multipliers, weights = zip(*[difficulty_params(d)[1:] for d in difficulties])
+
+    intervals, priorities = _adjust_batch(
+        np.array(raws), np.array(rates), np.array(multipliers), np.array(weights)
+    )
+    for i in range(len(raws)):
+        assert intervals[i] == _adjust(raws[i], rates[i], multipliers[i])
+        assert priorities[i] == _priority(intervals[i], weights[i], rates[i])
+
+@pytest.mark.parametrize("current_ease", [1.0, 1.3, 1.5, 2.0, 2.3, 2.5, 3.0])
+@pytest.mark.parametrize("performance", [0.0, 0.5999, 0.6, 0.7, 0.7999, 0.8, 1.0])
+def test_update_ease_matches_reference(current_ease, performance):
+    assert _update_ease(current_ease, performance, 1.3, 2.5) == pytest.approx(
+        reference_ease(current_ease, performance)
+    )